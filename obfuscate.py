@@ -1,148 +1,368 @@
 #!/usr/bin/env python3
 
+import os
 import re
 import sys
-import argparse
 import random
-from collections import OrderedDict
+from collections import Counter
+from functools import lru_cache
+
+# Prefer the RE2 DFA engine for the tokenizer when it is installed
+try:
+    import re2 as _re
+    # Pure-Python wrappers (e.g. google-re2) build every match object in
+    # Python, which is far slower than re for a token-per-match scan; a bare
+    # namespace package named re2 has no engine at all
+    if not hasattr(_re, "compile") or (getattr(_re, "__file__", None) or "").endswith(".py"):
+        _re = re
+except ImportError:
+    _re = re
 
 # CONFIGURATION
 LEVELS = ["mild", "moderate", "extreme"]
 
-# Identifiers that must never be renamed
-RESERVED = {
-    # C keywords
+# Seeded results are cached here, keyed on input, level, seed and this script
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "obfuscate")
+
+# C keywords — never renamed, never treated as operands
+C_KEYWORDS = frozenset(sys.intern(word) for word in (
     "auto", "break", "case", "char", "const", "continue", "default", "do",
     "double", "else", "enum", "extern", "float", "for", "goto", "if",
     "int", "long", "register", "return", "short", "signed", "sizeof", "static",
     "struct", "switch", "typedef", "union", "unsigned", "void", "volatile", "while",
+))
+
+# Identifiers that must never be renamed
+RESERVED = C_KEYWORDS | frozenset(sys.intern(word) for word in (
     # Standard library
     "printf", "scanf", "malloc", "free", "strlen", "strcpy", "strcmp", "memcpy",
     "fopen", "fclose", "fread", "fwrite", "exit", "NULL", "stdin", "stdout", "stderr",
     # Entry point
-    "main"
-}
+    "main",
+))
 
 # Visually confusing names for extreme mode (all valid C identifiers)
-CONFUSING = [
+CONFUSING = (
     "O0", "l1", "Il", "lI", "O0l", "l1I", "I1l", "OO0", "ll1", "Ill", "lll", "III",
     "oO0", "O0o", "_O", "_0", "_l", "_I", "__O", "__0", "__l", "__I", "O_0", "l_1",
     "I_l", "_O0", "_l1", "_Il", "OOO", "lll1", "IlI", "lIl", "IIl", "O0O0", "l1l1",
     "IlIl", "O00O", "l11l", "oOoO", "Oo0O", "oO0o", "lO0l", "IlO0", "OlIl", "lIO0",
     "O0Il", "Il0O", "lO0I"
-]
+)
+
+# Name pools for mild and moderate modes
+MILD_NAMES = tuple("xyzqwkjvnmftbpdr") + tuple(a + b for a in "xyzqw" for b in "0123456789")
+MODERATE_NAMES = tuple(p + b for p in ("_", "__", "___") for b in "xyzqwkjvnmftbpdr0123456789")
+
+# Python's str whitespace, spelled out: RE2's \s lacks \v, \x1c-\x1f and \x85
+_WS_CLASS = "[\t\n\v\f\r \x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
 
-# Tokenizer regex — captures all C token types
-TOKEN_REGEX = re.compile(
+# Tokenizer pattern — captures all C token types
+# Flags are inline (multiline + dotall) so the pattern compiles under both re and re2
+TOKEN_PATTERN = (
+    r'(?ms)'
     r'(?P<comment>/\*.*?\*/|//[^\n]*)|'
     r'(?P<string>"(?:[^"\\]|\\.)*")|'
     r'(?P<charlit>\'(?:[^\'\\]|\\.)*\')|'
     r'(?P<preproc>^\#[^\n]*)|'
     r'(?P<number>0[xX][0-9a-fA-F]+|0[0-7]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)|'
     r'(?P<ident>[A-Za-z_]\w*)|'
-    r'(?P<op><<=|>>=|<<|>>|->|&&|\|\||[+\-*/%&|^~!<>=?:]=?|==|!=|<=|>=|\+\+|--)|'
+    r'(?P<op><<=|>>=|<<|>>|->|&&|\|\||\+\+|--|[+\-*/%&|^~!<>=?:]=?|==|!=|<=|>=)|'
     r'(?P<punct>[{}()\[\];,.])|'
-    r'(?P<ws>\s+)',
-    re.VERBOSE | re.MULTILINE | re.DOTALL
+    r'(?P<ws>' + _WS_CLASS + r'+)'
 )
 
+# Mild-level fast path — only comments, identifiers and whitespace are rewritten.
+# Op/punct characters are left unmatched; anything else the tokenizer would
+# skip over is caught by `stray` and dropped, so output matches the full pipeline.
+MILD_PATTERN = (
+    r'(?ms)'
+    r'(?P<comment>/\*.*?\*/|//[^\n]*)|'
+    r'(?P<keep>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|^\#[^\n]*|'
+    r'0[xX][0-9a-fA-F]+|0[0-7]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)|'
+    r'(?P<ident>[A-Za-z_]\w*)|'
+    r'(?P<ws>' + _WS_CLASS + r'+)|'
+    r'(?P<stray>[^+\-*/%&|^~!<>=?:{}()\[\];,.])'
+)
+
+# Compiled on first use, so importing as a library stays cheap
+@lru_cache(maxsize=None)
+def token_regex():
+    return _re.compile(TOKEN_PATTERN)
+
+@lru_cache(maxsize=None)
+def mild_regex():
+    return _re.compile(MILD_PATTERN)
+
+@lru_cache(maxsize=None)
+def line_regex():
+    return re.compile(r'[^\n]+')
+
+def __getattr__(name):
+    # Keep the old module-level TOKEN_REGEX working
+    if name == "TOKEN_REGEX":
+        return token_regex()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Operators rewritten as macro calls
+_OP_MACROS = {"+": "_OB_A", "-": "_OB_S", "*": "_OB_M"}
+_MACRO_NAMES = frozenset(_OP_MACROS.values())
+
+# Binary operator precedence (lower binds tighter), used to check that
+# wrapping `a op b` in a macro call does not change what the code computes
+_PRECEDENCE = {
+    "*": 3, "/": 3, "%": 3, "+": 4, "-": 4, "<<": 5, ">>": 5,
+    "<": 6, "<=": 6, ">": 6, ">=": 6, "==": 7, "!=": 7,
+    "&": 8, "^": 9, "|": 10, "&&": 11, "||": 12, "?": 13, ":": 13,
+    "=": 14, "+=": 14, "-=": 14, "*=": 14, "/=": 14, "%=": 14,
+    "<<=": 14, ">>=": 14, "&=": 14, "^=": 14, "|=": 14,
+}
+_UNARY_OPS = frozenset(("+", "-", "*", "&"))  # Binary ops that can also be prefix
+_OPEN_PUNCT = frozenset(("(", "[", "{", "}", ",", ";"))  # May precede `a op b`
+_CLOSE_PUNCT = frozenset((")", "]", "}", ",", ";"))  # May follow `a op b`
+
+# `T * name` between these looks like a pointer declaration (T may be a typedef)
+_DECL_START = frozenset(("(", "{", "}", ",", ";"))
+_DECL_END = frozenset(("=", ";", ",", "[", ")"))
+
+# Interned token kinds, so passes can compare kinds by identity
+_K_COMMENT = sys.intern("comment")
+_K_PREPROC = sys.intern("preproc")
+_K_NUMBER = sys.intern("number")
+_K_IDENT = sys.intern("ident")
+_K_OP = sys.intern("op")
+_K_PUNCT = sys.intern("punct")
+_K_WS = sys.intern("ws")
+
+# Kinds that need a space kept between them when whitespace is dropped
+_SPACED_KINDS = frozenset((_K_IDENT, _K_NUMBER))
+
 # TOKENIZATION
 def tokenize(code):
-    return [(m.lastgroup, m.group()) for m in TOKEN_REGEX.finditer(code)]
+    """Split code into parallel lists of token kinds and values."""
+    kinds, values = [], []
+    for m in token_regex().finditer(code):
+        kind = sys.intern(m.lastgroup)
+        value = m.group()
+        if kind is _K_IDENT:
+            value = sys.intern(value)
+        kinds.append(kind)
+        values.append(value)
+    return kinds, values
 
-def detokenize(tokens):
-    return "".join(value for _, value in tokens)
+def detokenize(values):
+    return "".join(values)
 
 # NAME GENERATION
 def generate_names(count, style):
     """Generate obfuscated variable names."""
     if style == "mild":
-        pool = list("xyzqwkjvnmftbpdr") + [a + b for a in "xyzqw" for b in "0123456789"]
+        pool = MILD_NAMES
     elif style == "moderate":
-        pool = [p + b for p in ["_", "__", "___"] for b in "xyzqwkjvnmftbpdr0123456789"]
+        pool = MODERATE_NAMES
     else:  # extreme
-        pool = list(CONFUSING)
-        while len(pool) < count:
-            pool.append(random.choice(CONFUSING) + random.choice(["_", "0", "1"]))
-    random.shuffle(pool)
-    return pool[:count]
+        needed = max(0, count - len(CONFUSING))
+        bases = random.choices(CONFUSING, k=needed)
+        suffixes = random.choices(("_", "0", "1"), k=needed)
+        pool = CONFUSING + tuple(b + s for b, s in zip(bases, suffixes))
+    return random.sample(pool, min(count, len(pool)))
 
 # TRANSFORMATION PASSES
-def strip_comments(tokens):
-    return [(k, v) for k, v in tokens if k != "comment"]
-
-def rename_identifiers(tokens, level):
+def build_rename_map(idents, level):
+    """Map each renameable identifier in idents (with repeats) to a new name."""
     # Find all renameable identifiers (frequency-sorted)
-    freq = OrderedDict()
-    for kind, value in tokens:
-        if kind == "ident" and value not in RESERVED:
-            freq[value] = freq.get(value, 0) + 1
+    freq = Counter(v for v in idents if v not in RESERVED)
     
     # Generate mapping (most frequent get shortest names)
-    sorted_idents = sorted(freq.items(), key=lambda x: -x[1])
+    sorted_idents = freq.most_common()
     names = generate_names(len(sorted_idents), level)
-    mapping = {orig: names[i] for i, (orig, _) in enumerate(sorted_idents)}
+    return {orig: names[i] for i, (orig, _) in enumerate(sorted_idents)}
+
+def rename_identifiers(kinds, values, level):
+    """Build the rename map for all renameable identifiers."""
+    return build_rename_map((v for k, v in zip(kinds, values) if k is _K_IDENT), level)
+
+def transform_tokens(kinds, values, mapping, level):
+    """Strip comments, apply renames and collapse whitespace in one pass."""
+    # Only ident tokens can equal a mapping key, so every value goes through get()
+    get = mapping.get
     
-    # Apply mapping
-    renamed = []
-    for kind, value in tokens:
-        if kind == "ident" and value in mapping:
-            renamed.append((kind, mapping[value]))
-        else:
-            renamed.append((kind, value))
+    if level != "extreme":  # mild, moderate: no lookahead needed
+        out_kinds = [k for k in kinds if k is not _K_COMMENT]
+        out_values = [
+            ("\n" if "\n" in v else " ") if k is _K_WS else get(v, v)
+            for k, v in zip(kinds, values) if k is not _K_COMMENT
+        ]
+        return out_kinds, out_values
     
-    return renamed, mapping
-
-def compress_whitespace(tokens, level):
-    """Collapse whitespace based on level."""
-    result = []
-    for i, (kind, value) in enumerate(tokens):
-        if kind != "ws":
-            result.append((kind, value))
+    out_kinds, out_values = [], []
+    add_kind, add_value = out_kinds.append, out_values.append
+    prev = ""
+    n = len(kinds)
+    for i in range(n):
+        kind = kinds[i]
+        if kind is _K_COMMENT:
+            continue
+        
+        if kind is not _K_WS:
+            value = values[i]
+            add_kind(kind)
+            add_value(get(value, value))
+            prev = kind
             continue
         
-        prev = result[-1] if result else ("", "")
-        nxt = tokens[i + 1] if i + 1 < len(tokens) else ("", "")
+        # Peek past stripped comments
+        j = i + 1
+        while j < n and kinds[j] is _K_COMMENT:
+            j += 1
+        nxt = kinds[j] if j < n else ""
         
-        if level in ("mild", "moderate"):
-            result.append(("ws", "\n" if "\n" in value else " "))
-        else:  # extreme
-            # Always preserve newlines around preprocessor directives
-            if nxt[0] == "preproc" or prev[0] == "preproc":
-                result.append(("ws", "\n"))
-            # Keep space between adjacent identifiers/numbers
-            elif prev[0] in ("ident", "number") and nxt[0] in ("ident", "number"):
-                result.append(("ws", " "))
-            # Otherwise drop whitespace
-    
-    return result
+        # Always preserve newlines around preprocessor directives
+        if nxt is _K_PREPROC or prev is _K_PREPROC:
+            add_kind(_K_WS)
+            add_value("\n")
+            prev = _K_WS
+        # Keep space between adjacent identifiers/numbers
+        elif prev in _SPACED_KINDS and nxt in _SPACED_KINDS:
+            add_kind(_K_WS)
+            add_value(" ")
+            prev = _K_WS
+        # Otherwise drop whitespace
+    
+    return out_kinds, out_values
 
 def flatten_code(code, level):
     """Collapse code to minimum lines (extreme only)."""
     if level != "extreme":
         return code
     
-    lines = code.split("\n")
     result = []
-    buffer = ""
+    buffer = []
     
-    for line in lines:
-        stripped = line.strip()
+    # Walk non-empty lines in place rather than splitting the whole file
+    for m in line_regex().finditer(code):
+        stripped = m.group().strip()
         if not stripped:
             continue
         if stripped.startswith("#"):
             if buffer:
-                result.append(buffer.strip())
-                buffer = ""
+                result.append(" ".join(buffer))
+                buffer.clear()
             result.append(stripped)
         else:
-            buffer += " " + stripped
+            buffer.append(stripped)
     
     if buffer:
-        result.append(buffer.strip())
+        result.append(" ".join(buffer))
     
     return "\n".join(result)
 
+def _is_operand(kind, value):
+    return kind is _K_NUMBER or (kind is _K_IDENT and value not in C_KEYWORDS)
+
+def _skip_ws(kinds, i, step):
+    while 0 <= i < len(kinds) and kinds[i] is _K_WS:
+        i += step
+    return i
+
+def _safe_before(kinds, values, i, prec):
+    """Can the token at i (or start of input) precede an operand of a prec-level op?"""
+    i = _skip_ws(kinds, i, -1)
+    if i < 0:
+        return True
+    kind, value = kinds[i], values[i]
+    if kind is _K_PUNCT:
+        return value in _OPEN_PUNCT
+    if kind is _K_IDENT:
+        return value in ("return", "case")
+    if kind is not _K_OP or _PRECEDENCE.get(value, 0) <= prec:
+        return False
+    if value in _UNARY_OPS:  # Only binary if it follows an operand
+        j = _skip_ws(kinds, i - 1, -1)
+        return j >= 0 and _ends_operand(kinds, values, j)
+    return True
+
+def _ends_operand(kinds, values, i):
+    """Does the token at i end an operand (so a following + - * & is binary)?"""
+    kind, value = kinds[i], values[i]
+    if kind is not _K_PUNCT:
+        return _is_operand(kind, value)
+    if value == "]":
+        return True
+    if value != ")":
+        return False
+    
+    # Find the matching "(", noting whether the group could be a cast's type name;
+    # an operator, or one of our macro calls standing in for one, rules that out
+    depth = 0
+    type_like = True
+    while i >= 0:
+        kind, value = kinds[i], values[i]
+        if kind is _K_PUNCT:
+            if value == ")":
+                depth += 1
+            elif value == "(":
+                depth -= 1
+                if not depth:
+                    break
+        elif (kind is _K_OP and value != "*") or value in _MACRO_NAMES:
+            type_like = False
+        i -= 1
+    else:
+        return False
+    
+    # `f(x)`, `a[i](x)`, `(T)(x)` and `sizeof(T)` are operands; `(T) -x` is a cast
+    j = _skip_ws(kinds, i - 1, -1)
+    if j >= 0 and (values[j] in (")", "]", "sizeof")
+                   or (kinds[j] is _K_IDENT and values[j] not in C_KEYWORDS)):
+        return True
+    return not type_like
+
+def _safe_after(kinds, values, i, prec):
+    """Can the token at i (or end of input) follow an operand of a prec-level op?"""
+    i = _skip_ws(kinds, i, 1)
+    if i >= len(kinds):
+        return True
+    kind, value = kinds[i], values[i]
+    if kind is _K_PUNCT:
+        return value in _CLOSE_PUNCT
+    return kind is _K_OP and _PRECEDENCE.get(value, 0) >= prec
+
+def _looks_like_declaration(out_kinds, out_values, kinds, values, k):
+    """Is `T * name`, with name at k, shaped like a declaration or parameter?"""
+    i = _skip_ws(out_kinds, len(out_kinds) - 1, -1)
+    if i >= 0 and out_values[i] not in _DECL_START:
+        return False
+    j = _skip_ws(kinds, k + 1, 1)
+    return j >= len(kinds) or values[j] in _DECL_END
+
+def replace_operators(kinds, values):
+    """Rewrite `a + b`, `a - b` and `a * b` as macro calls where precedence allows."""
+    out_kinds, out_values = [], []
+    n = len(kinds)
+    i = 0
+    while i < n:
+        kind, value = kinds[i], values[i]
+        if _is_operand(kind, value):
+            j = _skip_ws(kinds, i + 1, 1)
+            macro = _OP_MACROS.get(values[j]) if j < n and kinds[j] is _K_OP else None
+            if macro:
+                k = _skip_ws(kinds, j + 1, 1)
+                prec = _PRECEDENCE[values[j]]
+                if (k < n and _is_operand(kinds[k], values[k])
+                        and _safe_before(out_kinds, out_values, len(out_kinds) - 1, prec)
+                        and _safe_after(kinds, values, k + 1, prec)
+                        and not (macro == "_OB_M" and kind is _K_IDENT and kinds[k] is _K_IDENT
+                                 and _looks_like_declaration(out_kinds, out_values, kinds, values, k))):
+                    out_kinds += (_K_IDENT, _K_PUNCT, kind, _K_PUNCT, kinds[k], _K_PUNCT)
+                    out_values += (macro, "(", value, ",", values[k], ")")
+                    i = k + 1
+                    continue
+        out_kinds.append(kind)
+        out_values.append(value)
+        i += 1
+    return out_kinds, out_values
+
 def inject_macros(code, level):
     """Insert macro definitions for operators."""
     if level == "mild":
@@ -158,83 +378,164 @@ def inject_macros(code, level):
         "#define _OB_N(a) (!(a))"
     ]
     
-    # Replace operators with macros (only outside strings)
-    parts = re.split(r'("(?:[^"\\]|\\.)*")', code)
-    for i in range(0, len(parts), 2):  # Only even indices (non-strings)
-        parts[i] = re.sub(r'\b(\w+)\s*\+\s*(\w+)\b', r'_OB_A(\1,\2)', parts[i])
-        parts[i] = re.sub(r'\b(\w+)\s*\-\s*(\w+)\b', r'_OB_S(\1,\2)', parts[i])
-        parts[i] = re.sub(r'\b(\w+)\s*\*\s*(\w+)\b', r'_OB_M(\1,\2)', parts[i])
-    code = "".join(parts)
-    
     # Insert macros after last #include
     lines = code.split("\n")
     insert_pos = next((i + 1 for i, l in enumerate(lines) if l.strip().startswith("#include")), 0)
-    for macro in reversed(macros):
-        lines.insert(insert_pos, macro)
+    lines[insert_pos:insert_pos] = macros
     
     return "\n".join(lines)
 
-def obfuscate_numbers(code, level):
-    """Replace numbers with equivalent expressions (extreme only)."""
-    if level != "extreme":
-        return code
+def number_expr(n):
+    """Pick a random expression equal to n."""
+    # Collect the forms that apply, then format only the one picked
+    forms = ["dec"]
+    if n >= 0:
+        forms.append("hex")
+    if 0 < n < 256:
+        forms.append("oct")
+        forms.append("mask")
+    if n > 1:
+        forms.append("sum")
+    if n > 0 and (n & (n - 1)) == 0:  # Power of 2
+        forms.append("shift")
     
-    def replace(match):
-        n = int(match.group(0))
-        choices = [str(n)]
-        
-        if n >= 0:
-            choices.append(hex(n))
-        if 0 < n < 256:
-            choices.append(f"0{oct(n)[2:]}")  # C octal: 0-prefix
-            choices.append(f"(0xFF&{hex(n)})")
-        if n > 1:
-            a, b = random.randint(1, n - 1), 0
-            b = n - a
-            choices.append(f"({a}+{b})")
-        if n > 0 and (n & (n - 1)) == 0:  # Power of 2
-            choices.append(f"(1<<{n.bit_length() - 1})")
-        
-        return random.choice(choices)
+    form = random.choice(forms)
+    if form == "hex":
+        return hex(n)
+    if form == "oct":
+        return f"0{oct(n)[2:]}"  # C octal: 0-prefix
+    if form == "mask":
+        return f"(0xFF&{hex(n)})"
+    if form == "sum":
+        a = random.randint(1, n - 1)
+        return f"({a}+{n - a})"
+    if form == "shift":
+        return f"(1<<{n.bit_length() - 1})"
+    return str(n)
+
+def obfuscate_numbers(kinds, values):
+    """Replace decimal integer literals in values (in place) with equivalent expressions."""
+    n = len(kinds)
+    for i in range(n):
+        if kinds[i] is not _K_NUMBER:
+            continue
+        value = values[i]
+        # Leave hex, octal and floating-point literals alone
+        if not value.isdecimal() or (value[0] == "0" and len(value) > 1):
+            continue
+        # Integer suffixes (10u, 10L) lex as an adjacent identifier; `.5` as punct + number
+        if (i + 1 < n and kinds[i + 1] is _K_IDENT) or (i and values[i - 1] == "."):
+            continue
+        values[i] = number_expr(int(value))
+
+def obfuscate_mild(code):
+    """Mild level in two regex scans, without building a token stream."""
+    regex = mild_regex()
+    mapping = build_rename_map(
+        (m.group() for m in regex.finditer(code) if m.lastgroup == "ident"), "mild")
     
-    # Only replace outside strings
-    parts = re.split(r'("(?:[^"\\]|\\.)*")', code)
-    for i in range(0, len(parts), 2):
-        parts[i] = re.sub(r'\b(\d+)\b', replace, parts[i])
+    def replace(match):
+        kind, value = match.lastgroup, match.group()
+        if kind == "ident":
+            return mapping.get(value, value)
+        if kind == "ws":
+            return "\n" if "\n" in value else " "
+        if kind == "keep":
+            return value
+        return ""  # comment, stray
     
-    return "".join(parts)
+    return regex.sub(replace, code), mapping
 
 # MAIN PIPELINE
 def obfuscate(code, level="moderate"):
-    # Tokenize
-    tokens = tokenize(code)
+    if level == "mild":
+        return obfuscate_mild(code)
     
-    # Strip comments
-    tokens = strip_comments(tokens)
+    # Tokenize
+    kinds, values = tokenize(code)
     
     # Rename identifiers
-    tokens, mapping = rename_identifiers(tokens, level)
+    mapping = rename_identifiers(kinds, values, level)
+    
+    # Strip comments, apply renames, compress whitespace
+    kinds, values = transform_tokens(kinds, values, mapping, level)
     
-    # Compress whitespace
-    tokens = compress_whitespace(tokens, level)
+    # Operator macros, then number tricks (extreme)
+    kinds, values = replace_operators(kinds, values)
+    if level == "extreme":
+        obfuscate_numbers(kinds, values)
     
     # Back to string
-    code = detokenize(tokens)
+    code = detokenize(values)
     
     # String-level transforms
     code = flatten_code(code, level)
     code = inject_macros(code, level)
-    code = obfuscate_numbers(code, level)
     
     return code, mapping
 
+# CACHING
+def cache_key(code, level, seed):
+    import hashlib
+    
+    h = hashlib.blake2b(digest_size=20)
+    with open(__file__, "rb") as f:
+        h.update(f.read())  # invalidate when the obfuscator changes
+    for part in (code, level, str(seed)):
+        h.update(part.encode("utf-8", "surrogateescape"))  # stdin keeps undecodable bytes as surrogates
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _is_cache_entry(entry):
+    """Does a decoded cache file hold a {"code": str, "mapping": {str: str}} entry?"""
+    if not isinstance(entry, dict):
+        return False
+    code, mapping = entry.get("code"), entry.get("mapping")
+    return (isinstance(code, str) and isinstance(mapping, dict)
+            and all(isinstance(v, str) for v in mapping.values()))  # JSON keys are always str
+
+def obfuscate_seeded(code, level, seed):
+    """Reproducible obfuscate(), served from the on-disk cache when possible."""
+    import json
+    
+    path = os.path.join(CACHE_DIR, cache_key(code, level, seed) + ".json")
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        entry = None
+    if _is_cache_entry(entry):
+        return entry["code"], entry["mapping"]
+    # Missing, unreadable or malformed entry: recompute and overwrite it
+    
+    random.seed(seed)
+    result, mapping = obfuscate(code, level)
+    
+    # Best effort — an unwritable cache only costs the next run a recompute
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8", errors="surrogateescape") as f:
+            json.dump({"code": result, "mapping": mapping}, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    
+    return result, mapping
+
 # CLI
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description="C code obfuscator")
     parser.add_argument("input", nargs="?", help="Input file (omit for stdin)")
     parser.add_argument("-o", "--output", help="Output file (omit for stdout)")
     parser.add_argument("-l", "--level", default="moderate", choices=LEVELS)
     parser.add_argument("--map", action="store_true", help="Show rename map")
+    parser.add_argument("--seed", type=int, help="RNG seed (reproducible output, cached across runs)")
     parser.add_argument("--levels", action="store_true", help="List levels")
     args = parser.parse_args()
     
@@ -253,7 +554,10 @@ def main():
         code = sys.stdin.read()
     
     # Obfuscate
-    result, mapping = obfuscate(code, args.level)
+    if args.seed is not None:
+        result, mapping = obfuscate_seeded(code, args.level, args.seed)
+    else:
+        result, mapping = obfuscate(code, args.level)
     
     # Show mapping if requested
     if args.map: